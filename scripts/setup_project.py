@@ -1,19 +1,70 @@
 import argparse
+import os
 import re
-import shutil
-import subprocess
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, NoReturn, TypedDict
+
+if TYPE_CHECKING:
+    import threading
+
+# subprocess and threading are imported where used so --dry-run never loads them
+# (shutil is deferred too, but argparse's HelpFormatter imports it regardless)
 
 PROJECT_TYPES = {"library", "cli", "service"}
 
-# Agent documentation templates for specific project types
+# Generated source files, pre-encoded %-format templates keyed on b"package"
+LIB_API = b"# Public library API\n"
+CLI_MAIN = (
+    b"from %(package)s.app.cli import main\n\n"
+    b'if __name__ == "__main__":\n'
+    b"    raise SystemExit(main())\n"
+)
+CLI_APP = b'def main() -> int:\n    print("CLI entrypoint")\n    return 0\n'
+SVC_MAIN = b'def run() -> None:\n    print("Service starting...")\n'
+SVC_HEALTHCHECK = b"def check() -> bool:\n    return True\n"
+
+
+class Plan(TypedDict):
+    dirs: tuple[str, ...]  # leaf subpackages; mkdir(parents=True) fills the rest
+    files: tuple[tuple[str, bytes], ...]  # paths relative to the package root
+
+
+# Everything each project type creates under src/<package>, computed once
+PLAN: dict[str, Plan] = {
+    "library": {"dirs": ("core",), "files": (("core/api.py", LIB_API),)},
+    "cli": {
+        "dirs": ("core", "app"),
+        "files": (("__main__.py", CLI_MAIN), ("app/cli.py", CLI_APP)),
+    },
+    "service": {
+        "dirs": ("core", "app", "infra"),
+        "files": (("app/main.py", SVC_MAIN), ("infra/healthcheck.py", SVC_HEALTHCHECK)),
+    },
+}
+
+# A path to create and its contents; None marks a directory
+Action = tuple[Path, bytes | None]
+
+# A background delete and the errors it raised, see remove_tree_in_background
+Cleanup = tuple["threading.Thread", list[OSError]]
+
+# `name = "..."` line in pyproject.toml, matched on raw bytes
+_NAME_RE = re.compile(rb"^(name\s*=\s*)([\"']).*?([\"'])", re.MULTILINE)
+
+# Generic 'src/' placeholder line in the agent manifests
+_SRC_PLACEHOLDER_RE = re.compile(
+    r"^├── src/.*\(populated by setup script\)$", re.MULTILINE
+)
+
+# Agent documentation templates for specific project types. __init__.py is
+# listed first so dropping it for namespace packages leaves valid connectors.
 ARCH_DOCS = {
     "library": """├── src/
 │   └── {package_name}/
-│       ├── core/
-│       │   └── api.py       # Public API surface
-│       └── __init__.py
+│       ├── __init__.py
+│       └── core/
+│           └── api.py       # Public API surface
 """,
     "cli": """├── src/
 │   └── {package_name}/
@@ -24,44 +75,28 @@ ARCH_DOCS = {
 """,
     "service": """├── src/
 │   └── {package_name}/
+│       ├── __init__.py
 │       ├── app/
 │       │   └── main.py      # Service entry point and wiring
 │       ├── core/            # Domain logic (pure Python, no I/O)
-│       ├── infra/           # External adapters (database, API clients)
-│       └── __init__.py
+│       └── infra/           # External adapters (database, API clients)
 """,
 }
 
 
-def die(message: str) -> None:
+def die(message: str) -> NoReturn:
     print(f"error: {message}", file=sys.stderr)
     sys.exit(1)
 
 
 def log(action: str, path: Path, dry_run: bool) -> None:
     prefix = "[DRY-RUN]" if dry_run else "[CREATE]"
-    print(f"{prefix} {action}: {path}")
-
-
-def touch_init(path: Path, *, dry_run: bool) -> None:
-    if path.exists():
-        return
-
-    if not dry_run:
-        path.mkdir(parents=True, exist_ok=True)
-        (path / "__init__.py").touch(exist_ok=True)
-
-
-def create_file(path: Path, content: str, *, dry_run: bool) -> None:
-    if path.exists():
-        die(f"Refusing to overwrite existing file: {path}")
-
-    if not dry_run:
-        path.write_text(content, encoding="utf-8")
+    # One write per line; print() issues separate writes for the text and "\n"
+    sys.stdout.write(f"{prefix} {action}: {path}\n")
 
 
-def update_pyproject_name(new_name: str, *, dry_run: bool) -> None:
-    pyproject_path = Path.cwd() / "pyproject.toml"
+def update_pyproject_name(root: Path, new_name: str, *, dry_run: bool) -> None:
+    pyproject_path = root / "pyproject.toml"
     if not pyproject_path.exists():
         print(f"warning: {pyproject_path} not found, skipping name update.")
         return
@@ -70,98 +105,146 @@ def update_pyproject_name(new_name: str, *, dry_run: bool) -> None:
     if dry_run:
         return
 
-    content = pyproject_path.read_text(encoding="utf-8")
-    new_content = re.sub(
-        r"^(name\s*=\s*)([\"']).*?([\"'])",
-        f"\\1\\2{new_name}\\3",
-        content,
-        flags=re.MULTILINE,
-    )
+    # Work on bytes to skip the UTF-8 decode/encode round trip
+    content = new_content = pyproject_path.read_bytes()
+    # Substring scan first; the regex only runs if a name key can exist
+    if b"name" in content:
+        replacement = rb"\g<1>\g<2>" + new_name.encode() + rb"\g<3>"
+        new_content = _NAME_RE.sub(replacement, content, count=1)
 
     if content == new_content:
         print("  (no changes made to pyproject.toml name)")
     else:
-        pyproject_path.write_text(new_content, encoding="utf-8")
+        pyproject_path.write_bytes(new_content)
 
 
-def cleanup_legacy(root: Path, *, dry_run: bool) -> None:
-    """Removes the initial template placeholders."""
-    legacy_src = root / "src" / "template_project"
-    legacy_test = root / "tests" / "test_basic.py"
+def scan_dir(directory: Path | str) -> dict[str, os.DirEntry[str]]:
+    """Lists a directory once, returning no entries if it is missing."""
+    try:
+        with os.scandir(directory) as it:
+            return {entry.name: entry for entry in it}
+    except FileNotFoundError:
+        return {}
 
-    if legacy_src.exists():
-        prefix = "[DRY-RUN] [DELETE]" if dry_run else "[DELETE]"
-        print(f"{prefix} {legacy_src}")
-        if not dry_run:
-            shutil.rmtree(legacy_src)
 
-    if legacy_test.exists():
-        prefix = "[DRY-RUN] [DELETE]" if dry_run else "[DELETE]"
-        print(f"{prefix} {legacy_test}")
-        if not dry_run:
-            legacy_test.unlink()
+def remove_tree_in_background(path: str) -> Cleanup:
+    """Renames path aside and deletes it on a worker thread.
 
+    Errors raised by the delete are collected in the returned list; pass the
+    result to finish_cleanup to wait for the worker and report them.
+    """
+    import shutil
+    import threading
 
-def create_src_layout(src_pkg: Path, project_type: str, dry_run: bool) -> None:
-    touch_init(src_pkg, dry_run=dry_run)
-    touch_init(src_pkg / "core", dry_run=dry_run)
+    trash = f"{path}.trash"
+    try:
+        os.rename(path, trash)
+    except OSError as e:
+        # e.g. a leftover .trash from an interrupted run; delete in place
+        print(f"warning: could not move {path} aside ({e}); deleting it in place")
+        if os.path.lexists(trash):
+            print(f"warning: leaving {trash} behind; remove it manually")
+        trash = path
 
-    if project_type in {"cli", "service"}:
-        touch_init(src_pkg / "app", dry_run=dry_run)
+    errors: list[OSError] = []
 
-    if project_type == "service":
-        touch_init(src_pkg / "infra", dry_run=dry_run)
+    def remove() -> None:
+        try:
+            shutil.rmtree(trash)
+        except OSError as e:
+            errors.append(e)
 
+    worker = threading.Thread(target=remove)
+    worker.start()
+    return worker, errors
 
-def create_type_specific_files(
-    src_pkg: Path, project_type: str, package_name: str, dry_run: bool
-) -> None:
-    if project_type == "library":
-        create_file(
-            src_pkg / "core" / "api.py", "# Public library API\n", dry_run=dry_run
-        )
 
-    if project_type == "cli":
-        main_content = (
-            f"from {package_name}.app.cli import main\n\n"
-            'if __name__ == "__main__":\n'
-            "    raise SystemExit(main())\n"
-        )
-        create_file(src_pkg / "__main__.py", main_content, dry_run=dry_run)
-        create_file(
-            src_pkg / "app" / "cli.py",
-            'def main() -> int:\n    print("CLI entrypoint")\n    return 0\n',
-            dry_run=dry_run,
-        )
+def finish_cleanup(cleanup: Cleanup | None) -> None:
+    """Waits for a background delete and fails the run if it raised."""
+    if cleanup is None:
+        return
 
-    if project_type == "service":
-        create_file(
-            src_pkg / "app" / "main.py",
-            'def run() -> None:\n    print("Service starting...")\n',
-            dry_run=dry_run,
-        )
-        create_file(
-            src_pkg / "infra" / "healthcheck.py",
-            "def check() -> bool:\n    return True\n",
-            dry_run=dry_run,
-        )
+    worker, errors = cleanup
+    worker.join()
+    if errors:
+        die(f"failed to delete legacy template package: {errors[0]}")
 
 
-def create_tests_layout(
-    tests_root: Path, tests_pkg: Path, project_type: str, dry_run: bool
-) -> None:
-    if not tests_root.exists() and not dry_run:
-        tests_root.mkdir(parents=True, exist_ok=True)
+def cleanup_legacy(root: Path, *, dry_run: bool) -> Cleanup | None:
+    """Removes the initial template placeholders.
+
+    The legacy package is deleted on a worker thread; the returned handle must
+    be passed to finish_cleanup before exiting.
+    """
+    prefix = "[DRY-RUN] [DELETE]" if dry_run else "[DELETE]"
+    cleanup = None
+
+    legacy_src = scan_dir(root / "src").get("template_project")
+    if legacy_src is not None:
+        print(f"{prefix} {legacy_src.path}")
+        if not dry_run:
+            cleanup = remove_tree_in_background(legacy_src.path)
 
-    # Create distinct test types
-    for test_type in ["unit", "integration"]:
-        test_dir = tests_root / test_type
-        if not test_dir.exists() and not dry_run:
-            test_dir.mkdir(parents=True, exist_ok=True)
+    legacy_test = scan_dir(root / "tests").get("test_basic.py")
+    if legacy_test is not None:
+        print(f"{prefix} {legacy_test.path}")
+        if not dry_run:
+            os.unlink(legacy_test.path)
+
+    return cleanup
+
+
+def plan_actions(
+    src_pkg: Path,
+    tests_root: Path,
+    project_type: str,
+    package_name: str,
+    *,
+    namespace: bool = False,
+) -> list[Action]:
+    """Lists every directory and file to create, in creation order."""
+    plan = PLAN[project_type]
+    actions: list[Action] = []
+    for subpackage in plan["dirs"]:
+        actions.append((src_pkg / subpackage, None))
+        # PEP 420 namespace packages need no __init__.py
+        if not namespace:
+            actions.append((src_pkg / subpackage / "__init__.py", b""))
+
+    if not namespace:
+        actions.append((src_pkg / "__init__.py", b""))
+
+    values = {b"package": package_name.encode()}
+    actions += [(src_pkg / rel, template % values) for rel, template in plan["files"]]
+
+    # Distinct test types; tests_root comes along via parents=True
+    actions += [(tests_root / test_type, None) for test_type in ("unit", "integration")]
+    return actions
+
+
+def apply_plan(actions: list[Action]) -> None:
+    """Creates each planned path with one mkdir or one exclusive open."""
+    for path, data in actions:
+        if data is None:
+            try:
+                path.mkdir(parents=True)
+            except FileExistsError:
+                continue
+        else:
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            except FileExistsError:
+                die(f"Refusing to overwrite existing file: {path}")
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
 
 
 def setup_environment(dry_run: bool) -> None:
     if not dry_run:
+        import subprocess
+
         print("\nInstalling pre-commit hooks...")
         try:
             subprocess.run(["uv", "run", "pre-commit", "install"], check=True)
@@ -169,32 +252,51 @@ def setup_environment(dry_run: bool) -> None:
             print(f"warning: failed to install pre-commit hooks: {e}")
 
 
-def remove_git_remote(dry_run: bool) -> None:
+def remove_git_remote(root: Path, dry_run: bool) -> None:
+    # git itself resolves the gitdir (worktrees, submodules, --separate-git-dir)
+    # and applies config syntax rules that a text edit would have to replicate
     if not dry_run:
+        import subprocess
+
         print("\nRemoving git remote origin...")
         try:
             subprocess.run(
-                ["git", "remote", "remove", "origin"], check=True, capture_output=True
+                ["git", "remote", "remove", "origin"],
+                check=True,
+                capture_output=True,
+                cwd=root,
             )
-        except subprocess.CalledProcessError:
-            print("warning: git remote 'origin' not found or already removed.")
+        except subprocess.CalledProcessError as e:
+            # e.g. no such remote, or a section git cannot rewrite; surface why
+            detail = e.stderr.decode(errors="replace").strip()
+            print(f"warning: could not remove git remote 'origin': {detail}")
         except Exception as e:
             print(f"warning: failed to remove git remote origin: {e}")
 
 
-def update_manifests(package_name: str, project_type: str, *, dry_run: bool) -> None:
+def update_manifests(
+    root: Path,
+    package_name: str,
+    project_type: str,
+    *,
+    dry_run: bool,
+    namespace: bool = False,
+) -> None:
     manifests = ["GEMINI.md", "CODEX.md"]
 
     # Specific architecture block to insert
     arch_block = ARCH_DOCS.get(project_type, "").format(package_name=package_name)
+    if namespace:
+        arch_block = "".join(
+            line
+            for line in arch_block.splitlines(keepends=True)
+            if "── __init__.py" not in line
+        )
     replacement_tree = f"""├── src/                 # Source code
 {arch_block}"""
 
-    # Regex to replace the generic 'src/' placeholder line.
-    pattern = r"(├── src/.*\(populated by setup script\))"
-
     for manifest_name in manifests:
-        manifest_path = Path.cwd() / manifest_name
+        manifest_path = root / manifest_name
         if not manifest_path.exists():
             print(f"warning: {manifest_name} not found, skipping update.")
             continue
@@ -205,28 +307,42 @@ def update_manifests(package_name: str, project_type: str, *, dry_run: bool) ->
 
         content = manifest_path.read_text(encoding="utf-8")
 
-        if re.search(pattern, content):
-            new_content = re.sub(pattern, replacement_tree.strip(), content)
-            manifest_path.write_text(new_content, encoding="utf-8")
-        else:
+        new_content, count = content, 0
+        if "(populated by setup script)" in content:
+            new_content, count = _SRC_PLACEHOLDER_RE.subn(
+                replacement_tree.strip(), content, count=1
+            )
+        if count == 0:
             print(f"  (could not find generic src/ placeholder in {manifest_name})")
+        else:
+            manifest_path.write_text(new_content, encoding="utf-8")
 
 
-def print_tree(directory: Path, prefix: str = "") -> None:
-    """Recursively prints a visual tree of the directory structure."""
-    if not directory.exists():
-        return
+def subdir_frames(
+    directory: Path | str, prefix: str
+) -> list[tuple[os.DirEntry[str], str, bool]]:
+    """Returns (entry, prefix, is_last) for each subdirectory, last one first."""
+    try:
+        with os.scandir(directory) as it:
+            entries = [e for e in it if e.is_dir(follow_symlinks=False)]
+    except FileNotFoundError:
+        return []
 
-    # Filter for directories only
-    entries = sorted(
-        [e for e in directory.iterdir() if e.is_dir()], key=lambda e: e.name
-    )
-    for i, entry in enumerate(entries):
-        is_last = i == len(entries) - 1
+    entries.sort(key=lambda e: e.name)
+    last = len(entries) - 1
+    return [(entries[i], prefix, i == last) for i in range(last, -1, -1)]
+
+
+def walk_tree(directory: Path, prefix: str, lines: list[str]) -> None:
+    """Appends a visual tree of the directory structure to lines."""
+    # Explicit stack in place of recursion; frames are pushed last-first
+    stack = subdir_frames(directory, prefix)
+    while stack:
+        entry, entry_prefix, is_last = stack.pop()
         connector = "|__ " if is_last else "|-- "
-        print(f"{prefix}{connector}{entry.name}")
-        new_prefix = prefix + ("    " if is_last else "|   ")
-        print_tree(entry, new_prefix)
+        lines.append(f"{entry_prefix}{connector}{entry.name}")
+        new_prefix = entry_prefix + ("    " if is_last else "|   ")
+        stack.extend(subdir_frames(entry.path, new_prefix))
 
 
 def print_final_report(
@@ -238,16 +354,21 @@ def print_final_report(
     dry_run: bool,
 ) -> None:
     mode = "DRY RUN" if dry_run else "CREATED"
-    print(f"\n{mode}: initialized {project_type} project '{package_name}'.")
-    print(f"         updated pyproject.toml name to '{project_name}'")
+    lines = [
+        "",
+        f"{mode}: initialized {project_type} project '{package_name}'.",
+        f"         updated pyproject.toml name to '{project_name}'",
+    ]
 
     if not dry_run:
-        print("\nGenerated Structure:")
-        print(f"src/{package_name}")
-        print_tree(src_pkg, "  ")
-        print("\ntests/")
-        print_tree(Path("tests"), "  ")
-        print("")
+        lines += ["", "Generated Structure:", f"src/{package_name}"]
+        walk_tree(src_pkg, "  ", lines)
+        lines += ["", "tests/"]
+        walk_tree(Path("tests"), "  ", lines)
+        lines.append("")
+
+    # Emit the whole report in one write
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main() -> None:
@@ -259,6 +380,11 @@ def main() -> None:
     parser.add_argument(
         "--dry-run", action="store_true", help="Print actions without execution"
     )
+    parser.add_argument(
+        "--namespace-packages",
+        action="store_true",
+        help="Skip __init__.py files (PEP 420 namespace packages)",
+    )
 
     args = parser.parse_args()
     package_name, project_type, dry_run = args.name, args.type, args.dry_run
@@ -276,19 +402,33 @@ def main() -> None:
         die(f"--name must be a valid Python identifier. Got: {package_name!r}")
 
     project_name = package_name.replace("_", "-")
-    update_pyproject_name(project_name, dry_run=dry_run)
-    create_src_layout(src_pkg, project_type, dry_run)
-    create_type_specific_files(src_pkg, project_type, package_name, dry_run)
-    create_tests_layout(tests_root, tests_pkg, project_type, dry_run)
-    cleanup_legacy(root, dry_run=dry_run)
+    update_pyproject_name(root, project_name, dry_run=dry_run)
+    actions = plan_actions(
+        src_pkg,
+        tests_root,
+        project_type,
+        package_name,
+        namespace=args.namespace_packages,
+    )
+    if not dry_run:
+        apply_plan(actions)
+    cleanup = cleanup_legacy(root, dry_run=dry_run)
     setup_environment(dry_run)
-    remove_git_remote(dry_run)
-    update_manifests(package_name, project_type, dry_run=dry_run)
+    remove_git_remote(root, dry_run)
+    update_manifests(
+        root,
+        package_name,
+        project_type,
+        dry_run=dry_run,
+        namespace=args.namespace_packages,
+    )
 
     print_final_report(
         package_name, project_type, project_name, src_pkg, tests_pkg, dry_run
     )
 
+    finish_cleanup(cleanup)
+
 
 if __name__ == "__main__":
     main()
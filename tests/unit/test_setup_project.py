@@ -0,0 +1,161 @@
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+import setup_project
+
+FETCH = "fetch = +refs/heads/*:refs/remotes/origin/*\n"
+
+
+def git(cwd: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def init_repo(path: Path, remote_section: str) -> Path:
+    path.mkdir()
+    git(path, "init", "-q")
+    with (path / ".git" / "config").open("a", encoding="utf-8") as f:
+        f.write(remote_section)
+    return path
+
+
+@pytest.mark.parametrize(
+    "remote_section",
+    [
+        f'[remote "origin"]\n\turl = /x\n\t{FETCH}',
+        f'[remote "origin"]\nurl = /x\n{FETCH}',
+    ],
+    ids=["tab-indented", "unindented"],
+)
+def test_remove_git_remote(tmp_path: Path, remote_section: str) -> None:
+    repo = init_repo(tmp_path / "repo", remote_section)
+
+    setup_project.remove_git_remote(repo, dry_run=False)
+
+    config = git(repo, "config", "--list", "--local")
+    assert "remote.origin." not in config
+    assert "core.url" not in config
+    assert "core.fetch" not in config
+
+
+def test_remove_git_remote_mixed_case_section(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    repo = init_repo(tmp_path / "repo", f'[Remote "origin"]\n  url = /x\n{FETCH}')
+
+    setup_project.remove_git_remote(repo, dry_run=False)
+
+    # Older git refuses to remove a mixed-case section; either way the config
+    # must stay intact, with no keys leaking into the preceding section
+    config = git(repo, "config", "--list", "--local")
+    assert "core.url" not in config
+    assert "core.fetch" not in config
+    if "remote.origin.url" in config:
+        assert "remote.origin.fetch" in config
+        assert "could not remove git remote 'origin'" in capsys.readouterr().out
+
+
+def test_remove_git_remote_from_worktree(tmp_path: Path) -> None:
+    repo = init_repo(tmp_path / "repo", '[remote "origin"]\n\turl = /x\n')
+    git(repo, "commit", "-q", "--allow-empty", "-m", "init")
+    worktree = tmp_path / "worktree"
+    git(repo, "worktree", "add", "-q", str(worktree))
+
+    setup_project.remove_git_remote(worktree, dry_run=False)
+
+    assert git(repo, "remote") == ""
+
+
+def test_remove_git_remote_dry_run_keeps_origin(tmp_path: Path) -> None:
+    repo = init_repo(tmp_path / "repo", '[remote "origin"]\n\turl = /x\n')
+
+    setup_project.remove_git_remote(repo, dry_run=True)
+
+    assert git(repo, "remote") == "origin\n"
+
+
+@pytest.mark.parametrize("project_type", sorted(setup_project.PROJECT_TYPES))
+def test_plan_actions_namespace_packages_skip_init(
+    tmp_path: Path, project_type: str
+) -> None:
+    def inits(*, namespace: bool) -> list[Path]:
+        actions = setup_project.plan_actions(
+            tmp_path / "src" / "pkg",
+            tmp_path / "tests",
+            project_type,
+            "pkg",
+            namespace=namespace,
+        )
+        return [path for path, _ in actions if path.name == "__init__.py"]
+
+    assert inits(namespace=False)
+    assert inits(namespace=True) == []
+
+
+@pytest.mark.parametrize("project_type", sorted(setup_project.PROJECT_TYPES))
+def test_update_manifests_namespace_packages_omit_init(
+    tmp_path: Path, project_type: str
+) -> None:
+    placeholder = "├── src/                 # Source code (populated by setup script)\n"
+    for name in ("GEMINI.md", "CODEX.md"):
+        (tmp_path / name).write_text(f"# Layout\n{placeholder}", encoding="utf-8")
+
+    setup_project.update_manifests(
+        tmp_path, "pkg", project_type, dry_run=False, namespace=True
+    )
+
+    for name in ("GEMINI.md", "CODEX.md"):
+        content = (tmp_path / name).read_text(encoding="utf-8")
+        assert "└── pkg/" in content
+        assert "__init__.py" not in content
+
+
+def make_legacy_tree(root: Path) -> Path:
+    legacy = root / "src" / "template_project"
+    legacy.mkdir(parents=True)
+    (legacy / "__init__.py").touch()
+    return legacy
+
+
+def test_cleanup_legacy_removes_template_package(tmp_path: Path) -> None:
+    legacy = make_legacy_tree(tmp_path)
+
+    setup_project.finish_cleanup(setup_project.cleanup_legacy(tmp_path, dry_run=False))
+
+    assert not legacy.exists()
+    assert not legacy.with_name("template_project.trash").exists()
+
+
+def test_cleanup_legacy_fails_run_when_delete_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    make_legacy_tree(tmp_path)
+
+    def rmtree(path: str) -> None:
+        raise PermissionError(f"denied: {path}")
+
+    monkeypatch.setattr(shutil, "rmtree", rmtree)
+    cleanup = setup_project.cleanup_legacy(tmp_path, dry_run=False)
+
+    with pytest.raises(SystemExit):
+        setup_project.finish_cleanup(cleanup)
+
+
+def test_cleanup_legacy_warns_about_leftover_trash(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    legacy = make_legacy_tree(tmp_path)
+    trash = legacy.with_name("template_project.trash")
+    (trash / "stale").mkdir(parents=True)
+
+    setup_project.finish_cleanup(setup_project.cleanup_legacy(tmp_path, dry_run=False))
+
+    assert not legacy.exists()
+    assert f"leaving {trash} behind" in capsys.readouterr().out